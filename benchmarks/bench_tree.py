@@ -0,0 +1,100 @@
+"""Allocation benchmark for ``ProgressTree.draw``
+
+Compares memory allocated per frame when the structure of the tree is
+resolved again on every draw (as ``ProgressTree.draw`` did before trees
+were compiled) against drawing a ``CompiledTree`` in which one leaf
+changed since the previous frame.
+
+Usage: ``python -m benchmarks.bench_tree [fan_out] [depth] [frames]``
+"""
+from __future__ import print_function
+
+import sys
+import time
+import tracemalloc
+from copy import deepcopy
+from io import StringIO
+
+from blessings import Terminal
+
+from progressive.bar import Bar
+from progressive.tree import ProgressTree, Value, BarDescriptor, compile
+
+
+class FakeTerminal(Terminal):
+    """xterm-256color ``Terminal`` of fixed size writing to a ``StringIO``"""
+
+    height = 100000
+    width = 120
+
+    def __init__(self):
+        super(FakeTerminal, self).__init__(
+            kind="xterm-256color", stream=StringIO(), force_styling=True
+        )
+
+
+def make_tree(fan_out, depth, leaf_values):
+    if depth == 0:
+        v = Value(0)
+        leaf_values.append(v)
+        return BarDescriptor(type=Bar, value=v, kwargs=dict(max_value=100))
+    return dict(("Node {}".format(i), make_tree(fan_out, depth - 1,
+                                                 leaf_values))
+                for i in range(fan_out))
+
+
+def measure(draw, leaf_values, frames):
+    """Run ``draw`` ``frames`` times, bumping one leaf before each
+
+    :returns: (peak bytes allocated per frame, seconds per frame)
+    """
+    draw()
+    peak_total = 0
+    tracemalloc.start()
+    for i in range(frames):
+        leaf_values[i % len(leaf_values)].value += 1
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        draw()
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - before
+    tracemalloc.stop()
+
+    start = time.time()
+    for i in range(frames):
+        leaf_values[i % len(leaf_values)].value += 1
+        draw()
+    elapsed = time.time() - start
+    return peak_total / frames, elapsed / frames
+
+
+def main(fan_out=4, depth=3, frames=50):
+    leaf_values = []
+    tree = make_tree(fan_out, depth, leaf_values)
+    bar_desc = BarDescriptor(type=Bar)
+
+    def make_resolving_draw():
+        n = ProgressTree(term=FakeTerminal())
+
+        def draw():
+            # Resolve the structure of a fresh copy of the tree every
+            #   frame, as draws used to
+            n.draw(compile(deepcopy(tree), bar_desc))
+        return draw
+
+    def make_compiled_draw():
+        n = ProgressTree(term=FakeTerminal(), diff=True)
+        compiled = compile(tree, bar_desc)
+        return lambda: n.draw(compiled)
+
+    print("{} leaves, {} nodes".format(len(leaf_values),
+                                       len(compile(tree, bar_desc))))
+    for name, draw in [("resolved per frame", make_resolving_draw()),
+                       ("compiled", make_compiled_draw())]:
+        size, secs = measure(draw, leaf_values, frames)
+        print("{:>20}: {:>12.0f} peak B/frame {:>9.3f} ms/frame".format(
+            name, size, secs * 1000))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -1 +1,8 @@
 __version__ = "0.3.4"
+
+try:
+    from progressive.aio import live
+except ImportError:
+    # Dependencies are not installed yet (e.g., when imported by setup.py
+    #   for ``__version__``) or there is no asyncio (Python 2)
+    pass
@@ -0,0 +1,172 @@
+"""asyncio support
+
+Drawing never blocks the event loop on terminal I/O: frames are written
+to an in-memory buffer which is written out to the stream's file
+descriptor only when the loop reports it writable.
+"""
+from __future__ import division
+
+import asyncio
+import os
+import select
+import sys
+
+from blessings import Terminal
+
+from progressive.bar import Bar
+from progressive.threaded import draw_frame
+from progressive.tree import ProgressTree, Value
+
+
+class NonBlockingStream(object):
+    """Write-only file-like object that writes to a file descriptor from
+    an event loop
+
+    ``write`` only buffers; ``flush`` schedules the buffer to be written
+    out in chunks small enough to never block, as the loop reports the
+    file descriptor writable.
+
+    :type  stream: file
+    :param stream: Stream to write to; must have a file descriptor
+    :type  loop: asyncio.AbstractEventLoop
+    """
+
+    def __init__(self, stream, loop):
+        self.stream = stream
+        self.encoding = getattr(stream, "encoding", None) or "utf-8"
+        self._fd = stream.fileno()
+        self._loop = loop
+        self._buffer = bytearray()
+        self._writing = False
+        self._waiters = []
+        # Anything already buffered by ``stream`` must come first
+        stream.flush()
+
+    def fileno(self):
+        return self._fd
+
+    def isatty(self):
+        return os.isatty(self._fd)
+
+    def write(self, s):
+        self._buffer += s.encode(self.encoding, "replace")
+
+    def flush(self):
+        if self._buffer and not self._writing:
+            self._writing = True
+            try:
+                self._loop.add_writer(self._fd, self._on_writable)
+            except (NotImplementedError, PermissionError, ValueError):
+                # The loop cannot watch this kind of file descriptor,
+                #   e.g., regular files or Windows' proactor loop
+                data = bytes(self._buffer)
+                del self._buffer[:]
+                future = self._loop.run_in_executor(None, self._write_all,
+                                                    data)
+                future.add_done_callback(lambda f: self._done())
+
+    def drain(self):
+        """Wait until everything flushed so far has been written
+
+        :rtype: asyncio.Future
+        """
+        future = self._loop.create_future()
+        if self._writing:
+            self._waiters.append(future)
+        else:
+            future.set_result(None)
+        return future
+
+    def _on_writable(self):
+        try:
+            n = os.write(self._fd, bytes(self._buffer[:select.PIPE_BUF]))
+        except (BlockingIOError, InterruptedError):
+            return
+        del self._buffer[:n]
+        if not self._buffer:
+            self._loop.remove_writer(self._fd)
+            self._done()
+
+    def _write_all(self, data):
+        while data:
+            data = data[os.write(self._fd, data):]
+
+    def _done(self):
+        self._writing = False
+        if self._buffer:
+            self.flush()
+            return
+        waiters, self._waiters = self._waiters, []
+        for future in waiters:
+            if not future.done():
+                future.set_result(None)
+
+
+class Live(object):
+    """Asynchronous context manager redrawing progress on the event loop
+
+    See ``live``.
+    """
+
+    def __init__(self, source, fps=10, stream=None, **kwargs):
+        self.source = source
+        self.interval = 1 / fps
+        self._stream_arg = sys.stdout if stream is None else stream
+        self._kwargs = kwargs
+        self.stream = self.term = self.target = None
+        self._handle = None
+        self._frames = 0
+
+    def __aenter__(self):
+        loop = asyncio.get_event_loop()
+        self.stream = NonBlockingStream(self._stream_arg, loop)
+        # The terminal is set up from the real file descriptor, as given
+        #   by ``self.stream.fileno``
+        self.term = Terminal(stream=self.stream)
+        if isinstance(self.source, Value):
+            self.target = Bar(term=self.term, **self._kwargs)
+        else:
+            self.target = ProgressTree(term=self.term, diff=True,
+                                       **self._kwargs)
+        self._tick()
+        future = loop.create_future()
+        future.set_result(self)
+        return future
+
+    def __aexit__(self, exc_type, exc_value, traceback):
+        self._handle.cancel()
+        self._draw_frame()
+        self.target.finish()
+        return self.stream.drain()
+
+    def _tick(self):
+        self._draw_frame()
+        self._handle = asyncio.get_event_loop().call_later(self.interval,
+                                                           self._tick)
+
+    def _draw_frame(self):
+        draw_frame(self.target, self.source, self._frames, {})
+        self._frames += 1
+
+
+def live(source, fps=10, stream=None, **kwargs):
+    """Redraw progress of ``source`` on the running event loop, e.g.,:
+
+        async with progressive.live(tree):
+            await gather(*workers)
+
+    Coroutines only have to change ``Value``s; a frame is drawn every
+    ``1 / fps`` seconds and once more on exit, and exiting waits for
+    everything drawn to have been written.
+
+    :type  source: Value|dict|CompiledTree|ArrayTree
+    :param source: A ``Value`` to draw a ``Bar`` for, or a tree to draw
+        a ``ProgressTree`` (in diff mode) for
+    :type  fps: float
+    :param fps: Number of frames to draw per second
+    :type  stream: file|NoneType
+    :param stream: Stream to draw to; ``sys.stdout`` by default
+    :param kwargs: Keyword arguments for the ``Bar`` or ``ProgressTree``
+    :rtype: Live
+    """
+    return Live(source, fps=fps, stream=stream, **kwargs)
@@ -4,7 +4,7 @@ from __future__ import division
 from __future__ import unicode_literals
 
 from progressive.cursor import Cursor
-from progressive.util import floor, ensure, u
+from progressive.util import floor, ensure, u, monotonic
 from progressive.exceptions import ColorUnsupportedError, WidthOverflowError
 
 
@@ -70,6 +70,14 @@ class Bar(object):
         may not be supported by the terminal; ``False`` forces use of
         the fallback formatting; ``None`` does not force anything
         and allows automatic detection as usual.
+    :type  min_interval: float
+    :param min_interval: Minimum number of seconds between draws; a
+        ``draw`` arriving sooner than this after the previous one only
+        records its value, to be drawn by a later ``draw`` or by
+        ``finish``. Draws of ``max_value`` or more are never suppressed.
+    :type  max_fps: float|NoneType
+    :param max_fps: Maximum number of draws per second; if set, this
+        takes precedence over ``min_interval``
     """
 
     def __init__(
@@ -78,7 +86,7 @@ class Bar(object):
             empty_color=7, back_color=None, filled_char=u' ',
             empty_char=u' ', start_char=u'', end_char=u'', fallback=True,
             fallback_empty_char=u'◯', fallback_filled_char=u'◉',
-            force_color=None
+            force_color=None, min_interval=0, max_fps=None
     ):
         self.cursor = Cursor(term)
         self.term = self.cursor.term
@@ -102,6 +110,10 @@ class Bar(object):
         self._start_char = start_char
         self._end_char = end_char
 
+        self._min_interval = 1 / max_fps if max_fps else min_interval
+        self._last_draw = float("-inf")
+        self._pending = None
+
         # Setup callables and characters depending on if terminal has
         #   has color support
         if force_color is not None:
@@ -336,13 +348,14 @@ class Bar(object):
     # Public Methods #
     ##################
 
-    def draw(self, value, newline=True, flush=True):
-        """Draw the progress bar
+    def render(self, value):
+        """Render the progress bar without writing it
 
         :type  value: int
         :param value: Progress value relative to ``self.max_value``
-        :type  newline: bool
-        :param newline: If this is set, a newline will be written after drawing
+        :rtype: [unicode, ...]
+        :returns: Lines making up the bar (including the title line
+            if ``title_pos`` is "above" or "below")
         """
         # This is essentially winch-handling without having
         #   to do winch-handling; cleanly redrawing on winch is difficult
@@ -351,7 +364,7 @@ class Bar(object):
         #   the terminal since the code is mostly written dynamically
         #   and many attributes and dynamically calculated properties.
         self._measure_terminal()
-        
+
         # To avoid zero division, set amount_complete to 100% if max_value has been stupidly set to 0
         amount_complete = 1.0 if self.max_value == 0 else value / self.max_value
         fill_amount = int(floor(amount_complete * self.max_width))
@@ -364,14 +377,6 @@ class Bar(object):
             u"{}%".format(int(floor(amount_complete * 100)))
         )
 
-        # Write title if supposed to be above
-        if self._title_pos == "above":
-            title_str = u"{}{}\n".format(
-                " " * self._indent,
-                self.title,
-            )
-            self._write(title_str, ignore_overflow=True)
-
         # Construct just the progress bar
         bar_str = u''.join([
             u(self.filled(self._filled_char * fill_amount)),
@@ -390,19 +395,51 @@ class Bar(object):
         bar_str = u"{} {}".format(bar_str, amount_complete_str)
         # Set back to normal after printing
         bar_str = u"{}{}".format(bar_str, self.term.normal)
-        # Finally, write the completed bar_str
-        self._write(bar_str, s_length=self.full_line_width)
-
-        # Write title if supposed to be below
-        if self._title_pos == "below":
-            title_str = u"\n{}{}".format(
-                " " * self._indent,
-                self.title,
-            )
-            self._write(title_str, ignore_overflow=True)
+        ensure(self.full_line_width <= self.columns, WidthOverflowError,
+               "Terminal has {} columns; attempted to write "
+               "a string {} of length {}.".format(
+                   self.columns, repr(bar_str), self.full_line_width))
+
+        # Title goes on its own line if supposed to be above or below
+        title_str = u"{}{}".format(" " * self._indent, self.title)
+        if self._title_pos == "above":
+            return [title_str, bar_str]
+        elif self._title_pos == "below":
+            return [bar_str, title_str]
+        else:
+            return [bar_str]
+
+    def draw(self, value, newline=True, flush=True):
+        """Draw the progress bar
+
+        :type  value: int
+        :param value: Progress value relative to ``self.max_value``
+        :type  newline: bool
+        :param newline: If this is set, a newline will be written after drawing
+        """
+        if self._min_interval:
+            now = monotonic()
+            if (now - self._last_draw < self._min_interval and
+                    value < self._max_value):
+                self._pending = (value, newline, flush)
+                return
+            self._last_draw = now
+            self._pending = None
+
+        lines = self.render(value)
+        self._write(u"\n".join(lines), ignore_overflow=True)
 
         # Newline to wrap up
         if newline:
             self.cursor.newline()
         if flush:
             self.cursor.flush()
+
+    def finish(self):
+        """Draw the value of the latest ``draw`` suppressed by
+        ``min_interval``, if any, so the true end state is shown
+        """
+        if self._pending is not None:
+            value, newline, flush = self._pending
+            self._last_draw = float("-inf")
+            self.draw(value, newline=newline, flush=flush)
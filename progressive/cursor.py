@@ -48,6 +48,16 @@ class Cursor(object):
         self.write(self.term.move_down)
         self.write(self.term.clear_bol)
 
+    def move_up(self, num_lines=1):
+        """Moves the cursor up ``num_lines`` lines"""
+        if num_lines > 0:
+            self.write(self.term.move_up * num_lines)
+
+    def move_down(self, num_lines=1):
+        """Moves the cursor down ``num_lines`` lines"""
+        if num_lines > 0:
+            self.write(self.term.move_down * num_lines)
+
     def clear_lines(self, num_lines=0):
         for i in range(num_lines):
             self.write(self.term.clear_eol)
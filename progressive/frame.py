@@ -0,0 +1,129 @@
+from progressive.cursor import Cursor
+from progressive.util import ensure
+
+
+class Frame(object):
+    """Line-diffing display of a block of lines
+
+    Keeps the lines of the previously drawn frame and, on each ``draw``,
+    only moves the cursor to and rewrites lines whose text changed.
+    Movement is relative to where the previous ``draw`` left the cursor,
+    i.e., at the start of the line just below the frame, so the cursor
+    must not be moved between draws (call ``reset`` if it was). A frame
+    identical to the previous one writes nothing at all.
+
+    :type  term: NoneType|blessings.Terminal
+    :param term: Terminal instance; if not given, will be created by the class
+    """
+
+    def __init__(self, term=None):
+        self.cursor = Cursor(term)
+        self.term = self.cursor.term
+        self._lines = None
+
+    ##################
+    # Public Methods #
+    ##################
+
+    def reset(self):
+        """Forget the previous frame
+
+        The next ``draw`` will write every line starting at the current
+        cursor position.
+        """
+        self._lines = None
+
+    def draw(self, lines, flush=True):
+        """Draw ``lines``, rewriting only those changed since the last draw
+
+        :type  lines: [unicode, ...]
+        :param lines: Lines of the frame, without trailing newlines
+        :type  flush: bool
+        :param flush: If this is set, output written will be flushed
+        :rtype: int
+        :returns: Number of lines that were written
+        """
+        lines = list(lines)
+        prev = self._lines
+        self._lines = lines
+
+        if prev is None:
+            for line in lines:
+                self._write_line(line)
+                self.cursor.newline()
+            written = len(lines)
+        elif len(prev) != len(lines):
+            # The shape of the frame changed; go back to the top
+            #   and repaint all of it
+            self.cursor.move_up(len(prev))
+            for line in lines:
+                self._write_line(line)
+                self.cursor.newline()
+            self.cursor.clear_lines(len(prev) - len(lines))
+            written = len(lines)
+        else:
+            self._lines = prev
+            written = self._rewrite(
+                (i, line) for i, line in enumerate(lines) if line != prev[i]
+            )
+
+        if flush and written:
+            self.cursor.flush()
+        return written
+
+    def update(self, changes, flush=True):
+        """Rewrite only the given lines of the previously drawn frame
+
+        Unlike ``draw``, lines not in ``changes`` are not even compared,
+        so the cost is proportional to the size of ``changes`` rather than
+        that of the frame.
+
+        :type  changes: {int: unicode}
+        :param changes: Mapping of line index to its new text; indices
+            must be within the previously drawn frame
+        :type  flush: bool
+        :param flush: If this is set, output written will be flushed
+        :rtype: int
+        :returns: Number of lines that were written
+        """
+        ensure(self._lines is not None, ValueError,
+               "A frame must be drawn before it can be updated.")
+        prev = self._lines
+        written = self._rewrite(
+            (i, line) for i, line in sorted(changes.items())
+            if line != prev[i]
+        )
+        if flush and written:
+            self.cursor.flush()
+        return written
+
+    ###################
+    # Private Methods #
+    ###################
+
+    def _rewrite(self, changes):
+        """Rewrite ``changes`` in place, moving relative to the line below
+        the frame
+
+        :type  changes: iterable of (int, unicode), in ascending order
+        :rtype: int
+        :returns: Number of lines that were written
+        """
+        written = 0
+        lines = self._lines
+        row = len(lines)
+        for i, line in changes:
+            self.cursor.move_up(row - i)
+            self.cursor.move_down(i - row)
+            self._write_line(line)
+            lines[i] = line
+            row = i
+            written += 1
+        if written:
+            self.cursor.move_down(len(lines) - row)
+            self.cursor.write(self.term.move_x(0))
+        return written
+
+    def _write_line(self, line):
+        self.cursor.write(u"".join([self.term.move_x(0), line,
+                                    self.term.clear_eol]))
@@ -0,0 +1,270 @@
+"""Aggregation of progress from many processes into one ``ProgressTree``
+
+An ``AggregationServer`` listens on a TCP or Unix socket for batches of
+progress deltas keyed by tree path, sent by ``AggregationClient``s, and
+draws all of them as a single tree, e.g.,:
+
+    # In the displaying process
+    with AggregationServer(("127.0.0.1", 8765)):
+        wait_for_jobs()
+
+    # In each worker
+    client = AggregationClient(("127.0.0.1", 8765))
+    for item in items:
+        process(item)
+        client.add(["Job", "Worker {}".format(n)], max_value=len(items))
+    client.close()
+
+Each batch is sent as a single line of JSON, a list of
+``[path, delta]`` or ``[path, delta, max_value]`` entries.
+"""
+from __future__ import division
+
+import json
+import socket
+import threading
+
+try:
+    import socketserver
+except ImportError:  # Python 2
+    import SocketServer as socketserver
+
+from progressive.bar import Bar
+from progressive.tree import ProgressTree, Value, BarDescriptor
+from progressive.util import ensure, monotonic
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                batch = json.loads(line.decode("utf-8"))
+            except ValueError:
+                continue
+            self.server.aggregator.apply(batch)
+
+
+class _TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+if hasattr(socket, "AF_UNIX"):
+    class _UnixServer(socketserver.ThreadingMixIn,
+                      socketserver.UnixStreamServer):
+        daemon_threads = True
+
+
+class AggregationServer(object):
+    """Server feeding progress from ``AggregationClient``s into one
+    ``ProgressTree``
+
+    Leaves are created as paths are first seen; deltas to a leaf are
+    added to its ``Value``.
+
+    :type  address: (str, int)|str
+    :param address: (host, port) to listen on TCP, or the path of a Unix
+        socket; port 0 picks a free port, see ``address``
+    :type  progress_tree: ProgressTree|NoneType
+    :param progress_tree: What to draw the tree with; a ``ProgressTree``
+        in diff mode is created if not given
+    :type  fps: float
+    :param fps: Number of frames to draw per second
+    :type  bar_desc: BarDescriptor|NoneType
+    :param bar_desc: For describing non-leaf bars; see ``ProgressTree.draw``
+    :type  leaf_kwargs: dict|NoneType
+    :param leaf_kwargs: kwargs for the ``Bar``s of leaves
+    """
+
+    def __init__(self, address, progress_tree=None, fps=10, bar_desc=None,
+                 leaf_kwargs=None):
+        if isinstance(address, tuple):
+            self._server = _TCPServer(address, _Handler)
+        else:
+            self._server = _UnixServer(address, _Handler)
+        self._server.aggregator = self
+        self.progress_tree = (ProgressTree(diff=True) if progress_tree is None
+                              else progress_tree)
+        self.interval = 1 / fps
+        self.bar_desc = bar_desc
+        self.leaf_kwargs = leaf_kwargs or {}
+        self.tree = {}
+        self._lock = threading.Lock()
+        self._structure_changed = False
+        self._stopping = threading.Event()
+        self._threads = []
+        self._error = None
+
+    @property
+    def address(self):
+        """Address the server is listening on"""
+        return self._server.server_address
+
+    ##################
+    # Public Methods #
+    ##################
+
+    def start(self):
+        """Start serving and drawing from daemon threads"""
+        ensure(not self._threads, RuntimeError,
+               "AggregationServer has already been started.")
+        self._stopping.clear()
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever,
+                             name="progressive-server"),
+            threading.Thread(target=self._render, name="progressive-render"),
+        ]
+        for thread in self._threads:
+            thread.daemon = True
+            thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving, wait for connected clients to disconnect and
+        draw the final frame
+
+        :raises: Any exception raised while drawing from the thread
+        """
+        if self._threads:
+            self._server.shutdown()
+        # Waits for the threads handling connections
+        self._server.server_close()
+        self._stopping.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        self.draw()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def apply(self, batch):
+        """Apply a batch of ``[path, delta]`` or ``[path, delta, max_value]``
+        entries; invalid entries are ignored
+        """
+        with self._lock:
+            for entry in batch:
+                try:
+                    self._apply(*entry)
+                except (TypeError, ValueError):
+                    continue
+
+    def draw(self):
+        """Draw the tree"""
+        with self._lock:
+            if self._structure_changed:
+                self._structure_changed = False
+                self.progress_tree.invalidate()
+            if self.tree:
+                self.progress_tree.draw(self.tree, self.bar_desc)
+
+    ###################
+    # Private Methods #
+    ###################
+
+    def _apply(self, path, delta, max_value=None):
+        ensure(isinstance(path, list) and path, ValueError,
+               "path must be a non-empty list")
+        subtree = self.tree
+        for k in path[:-1]:
+            subtree = subtree.setdefault(k, {})
+            ensure(type(subtree) is dict, ValueError,
+                   "{} is a leaf".format(k))
+        leaf = subtree.get(path[-1])
+        if leaf is None:
+            kwargs = dict(self.leaf_kwargs)
+            if max_value is not None:
+                kwargs["max_value"] = max_value
+            leaf = subtree[path[-1]] = BarDescriptor(
+                type=Bar, value=Value(0), kwargs=kwargs
+            )
+            self._structure_changed = True
+        ensure(isinstance(leaf, BarDescriptor), ValueError,
+               "{} is not a leaf".format(path[-1]))
+        if max_value is not None and leaf["kwargs"].get("max_value") != \
+                max_value:
+            leaf["kwargs"]["max_value"] = max_value
+            self._structure_changed = True
+        leaf["value"].add(delta)
+
+    def _render(self):
+        try:
+            while not self._stopping.wait(self.interval):
+                self.draw()
+        except Exception as e:
+            self._error = e
+
+
+class AggregationClient(object):
+    """Client sending progress to an ``AggregationServer``
+
+    Updates are coalesced per path and sent as one batch at most every
+    ``interval`` seconds, and on ``flush`` and ``close``.
+
+    :type  address: (str, int)|str
+    :param address: Address of the server; see ``AggregationServer``
+    :type  interval: float
+    :param interval: Minimum number of seconds between batches
+    """
+
+    def __init__(self, address, interval=0.1):
+        if isinstance(address, tuple):
+            self._sock = socket.create_connection(address)
+        else:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.connect(address)
+        self.interval = interval
+        # {path: [delta, max_value]}
+        self._pending = {}
+        self._last_send = monotonic()
+
+    def add(self, path, delta=1, max_value=None):
+        """Add ``delta`` to the leaf at ``path``
+
+        :type  path: [str, ...]
+        :param path: Keys from the root of the tree to the leaf
+        :type  max_value: int|NoneType
+        :param max_value: If given, sets the ``max_value`` of the leaf
+        """
+        key = tuple(path)
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = [delta, max_value]
+        else:
+            pending[0] += delta
+            if max_value is not None:
+                pending[1] = max_value
+        if monotonic() - self._last_send >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """Send all pending updates"""
+        self._last_send = monotonic()
+        if not self._pending:
+            return
+        batch = [
+            [list(path), delta] if max_value is None else
+            [list(path), delta, max_value]
+            for path, (delta, max_value) in self._pending.items()
+        ]
+        self._pending = {}
+        self._sock.sendall(json.dumps(batch, separators=(",", ":"))
+                           .encode("utf-8") + b"\n")
+
+    def close(self):
+        """Send pending updates and disconnect"""
+        self.flush()
+        self._sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
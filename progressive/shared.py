@@ -0,0 +1,136 @@
+"""Shared-memory values for ``multiprocessing`` workers
+
+Leaf values of a whole tree are allocated in one contiguous block of
+shared memory, which worker processes write to directly through
+``SharedValue``s, e.g.,:
+
+    leaves = SharedLeaves(compile(tree))
+    pool.map(work, [leaves.value(path) for path in leaves.leaf_positions])
+    # ... in the parent, draw ``leaves`` with a ``ProgressTree``
+"""
+from __future__ import division
+
+from multiprocessing import shared_memory
+
+from progressive.util import floor
+from progressive.vectorized import ArrayTree, np
+
+# Leaf values are stored as native signed 64-bit integers
+_ITEM_FORMAT = "q"
+_ITEM_SIZE = 8
+
+
+def _slots(shm, length, use_numpy):
+    """View of the first ``length`` values in ``shm``"""
+    if use_numpy:
+        return np.ndarray((length,), dtype=np.int64, buffer=shm.buf)
+    return shm.buf[:length * _ITEM_SIZE].cast(_ITEM_FORMAT)
+
+
+class SharedLeaves(ArrayTree):
+    """``ArrayTree`` whose leaf values live in shared memory
+
+    The creating process owns the block of shared memory and should
+    ``close`` and ``unlink`` it when done (or use this as a context
+    manager, which does both); after ``close``, the last values are
+    kept so the tree can still be drawn.
+
+    :type  compiled: CompiledTree
+    :param compiled: The tree to allocate leaf values for; they are
+        initialized from its ``Value``s
+    :type  use_numpy: bool|NoneType
+    :param use_numpy: See ``ArrayTree``
+    """
+
+    def __init__(self, compiled, use_numpy=None):
+        super(SharedLeaves, self).__init__(compiled, use_numpy=use_numpy)
+        initial = [int(v) for v in self.leaf_values]
+        self.shm = shared_memory.SharedMemory(
+            create=True, size=max(1, len(initial)) * _ITEM_SIZE
+        )
+        self.leaf_values = _slots(self.shm, len(initial), self.use_numpy)
+        for i, v in enumerate(initial):
+            self.leaf_values[i] = v
+
+    def value(self, path):
+        """Get a handle to the leaf at ``path`` for use in other processes
+
+        :rtype: SharedValue
+        """
+        return SharedValue(self.shm.name, self.leaf_positions[path])
+
+    def close(self):
+        """Detach from the shared memory, keeping a copy of the values"""
+        if self.shm is not None:
+            values = [int(v) for v in self.leaf_values]
+            if self.use_numpy:
+                self.leaf_values = np.array(values, dtype=np.int64)
+            else:
+                self.leaf_values.release()
+                self.leaf_values = values
+            self.shm.close()
+
+    def unlink(self):
+        """Free the shared memory; call once, from the creating process"""
+        if self.shm is not None:
+            self.shm.unlink()
+            self.shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        self.unlink()
+
+
+class SharedValue(object):
+    """Handle to a single leaf value of ``SharedLeaves``
+
+    Can be pickled to be sent to other processes, and attaches to the
+    shared memory on first use. Unlike ``Value``, ``add`` is not atomic
+    across processes, so each leaf should be changed by a single process
+    at a time.
+
+    :type  name: str
+    :param name: Name of the shared memory block
+    :type  index: int
+    :param index: Position of the leaf in the block
+    """
+
+    def __init__(self, name, index):
+        self.name = name
+        self.index = index
+        self._shm = None
+        self._slots = None
+
+    @property
+    def value(self):
+        return self._get_slots()[self.index]
+
+    @value.setter
+    def value(self, val):
+        self._get_slots()[self.index] = floor(val)
+
+    def add(self, delta=1):
+        """Add ``delta`` to the value"""
+        self._get_slots()[self.index] += floor(delta)
+
+    def close(self):
+        """Detach from the shared memory"""
+        if self._slots is not None:
+            self._slots.release()
+            self._shm.close()
+            self._shm = self._slots = None
+
+    def __getstate__(self):
+        return {"name": self.name, "index": self.index}
+
+    def __setstate__(self, state):
+        self.__init__(state["name"], state["index"])
+
+    def _get_slots(self):
+        if self._slots is None:
+            self._shm = shared_memory.SharedMemory(name=self.name)
+            self._slots = _slots(self._shm, self.index + 1, use_numpy=False)
+        return self._slots
@@ -0,0 +1,112 @@
+from __future__ import division
+
+import threading
+
+from progressive.tree import ProgressTree
+from progressive.util import ensure
+
+
+class RenderThread(object):
+    """Redraws a ``Bar`` or ``ProgressTree`` from a daemon thread
+
+    Threads doing the actual work then only have to change ``Value``s
+    (using ``Value.add`` if several threads change the same one), e.g.,:
+
+        with RenderThread(ProgressTree(diff=True), tree, fps=10):
+            run_workers(leaf_values)
+
+    A final frame is always drawn on ``stop``, so the true end state is
+    shown.
+
+    :type  target: Bar|ProgressTree
+    :param target: What to draw
+    :type  source: Value|dict|CompiledTree|ArrayTree
+    :param source: What to draw ``target`` with; a ``Value`` for a
+        ``Bar``, or the tree for a ``ProgressTree``
+    :type  fps: float
+    :param fps: Number of frames to draw per second
+    :param draw_kwargs: Additional keyword arguments to ``target.draw``
+    """
+
+    def __init__(self, target, source, fps=10, **draw_kwargs):
+        self.target = target
+        self.source = source
+        self.interval = 1 / fps
+        self._draw_kwargs = draw_kwargs
+        self._stopping = threading.Event()
+        self._thread = None
+        self._error = None
+        self._frames = 0
+
+    ##################
+    # Public Methods #
+    ##################
+
+    def start(self):
+        """Start drawing from a new daemon thread"""
+        ensure(self._thread is None, RuntimeError,
+               "RenderThread has already been started.")
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name="progressive-render")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the drawing thread and draw the final frame
+
+        :raises: Any exception raised while drawing from the thread
+        """
+        ensure(self._thread is not None, RuntimeError,
+               "RenderThread has not been started.")
+        self._stopping.set()
+        self._thread.join()
+        self._thread = None
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+        self._draw_frame()
+        self.target.finish()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    ###################
+    # Private Methods #
+    ###################
+
+    def _run(self):
+        try:
+            while True:
+                self._draw_frame()
+                if self._stopping.wait(self.interval):
+                    break
+        except Exception as e:
+            self._error = e
+
+    def _draw_frame(self):
+        draw_frame(self.target, self.source, self._frames, self._draw_kwargs)
+        self._frames += 1
+
+
+def draw_frame(target, source, frames, draw_kwargs):
+    """Draw a frame of ``target`` from ``source`` over the previous one
+
+    :param frames: Number of frames drawn before this one
+    """
+    cursor = target.cursor
+    if isinstance(target, ProgressTree):
+        if not target.diff:
+            cursor.restore()
+        target.draw(source, **draw_kwargs)
+    else:
+        # Redraw the bar over itself
+        if frames:
+            cursor.restore()
+        else:
+            cursor.save()
+        target.draw(source.value, **draw_kwargs)
@@ -1,21 +1,37 @@
 from __future__ import division
 
-from copy import deepcopy
+import threading
 
 from progressive.bar import Bar
 from progressive.cursor import Cursor
-from progressive.util import floor, ensure, merge_dicts
+from progressive.frame import Frame
+from progressive.util import floor, ensure, merge_dicts, monotonic
+from progressive.vectorized import ArrayTree
 from progressive.exceptions import LengthOverflowError
 
 
+# Guards changes to ``Value``s and their propagation to ``ProgressTree``
+#   nodes, so ``Value``s may be changed from several threads while being
+#   drawn from another
+_lock = threading.Lock()
+
+
 class Value(object):
     """Container class for use with ``BarDescriptor``
 
     Should be used for ``value`` argument when initializing
         ``BarDescriptor``, e.g., ``BarDescriptor(type=..., value=Value(10))``
+
+    Setting ``value`` and ``add`` are safe to use from several threads,
+        though ``value += n`` is not atomic; use ``add(n)`` instead.
     """
 
     def __init__(self, val=0):
+        self._value = 0
+        # Objects with an ``update(delta)`` method that are notified of
+        #   every change in value, i.e., the ``ProgressTree`` nodes
+        #   displaying this ``Value``
+        self._listeners = []
         self.value = val
 
     @property
@@ -24,7 +40,29 @@ class Value(object):
 
     @value.setter
     def value(self, val):
-        self._value = floor(val)
+        with _lock:
+            self._set(floor(val))
+
+    def add(self, delta=1):
+        """Atomically add ``delta`` to the value"""
+        with _lock:
+            self._set(floor(self._value + delta))
+
+    def _set(self, val):
+        delta = val - self._value
+        self._value = val
+        if delta:
+            for listener in self._listeners:
+                listener.update(delta)
+
+    def __getstate__(self):
+        # Listeners belong to whatever is displaying this ``Value``, so
+        #   copies do not inherit them
+        return {"_value": self._value}
+
+    def __setstate__(self, state):
+        self._value = state["_value"]
+        self._listeners = []
 
 
 class BarDescriptor(dict):
@@ -51,6 +89,156 @@ class BarDescriptor(dict):
     """
 
 
+class CompiledTree(object):
+    """Flat, pre-sorted table of the nodes of a tree
+
+    Created with ``compile``; node ``i`` of every attribute refers to
+    the same node, and nodes are in drawing order, i.e., every node comes
+    before its children, and siblings are sorted by key. This may be
+    passed to ``ProgressTree.draw`` in place of the tree it was compiled
+    from and must not be modified.
+
+    :ivar paths: Path of keys from the root of the tree to each node
+    :ivar parents: Index of each node's parent, or -1 for top-level nodes
+    :ivar depths: Depth of each node; top-level nodes are at depth 0
+    :ivar args: Args to instantiate each node's ``Bar`` with (besides
+        the terminal)
+    :ivar kwargs: Resolved kwargs to instantiate each node's ``Bar`` with
+        (besides ``indent``, which is up to the ``ProgressTree``)
+    :ivar values: Each leaf's ``Value``, or None for non-leaf nodes
+    :ivar max_values: ``max_value`` of each node; for non-leaf nodes,
+        the sum of that of their children
+    :ivar lines_required: Number of lines required to draw the tree, as
+        given by ``ProgressTree.lines_required``
+    """
+
+    __slots__ = ("paths", "parents", "depths", "args", "kwargs", "values",
+                 "max_values", "lines_required")
+
+    def __init__(self, paths, parents, depths, args, kwargs, values,
+                 max_values, lines_required):
+        self.paths = paths
+        self.parents = parents
+        self.depths = depths
+        self.args = args
+        self.kwargs = kwargs
+        self.values = values
+        self.max_values = max_values
+        self.lines_required = lines_required
+
+    def __len__(self):
+        return len(self.paths)
+
+
+def compile(tree, bar_desc=None):
+    """Compile ``tree`` into a ``CompiledTree``
+
+    All the work of resolving the structure of ``tree``, i.e., sorting,
+    merging ``bar_desc`` into non-leaf descriptors and summing
+    ``max_value``s is done once here rather than on every draw.
+
+    :type  tree: dict
+    :param tree: tree as described in ``BarDescriptor``
+    :type  bar_desc: BarDescriptor|NoneType
+    :param bar_desc: For describing non-leaf bars; see ``ProgressTree.draw``
+    :rtype: CompiledTree
+    """
+    bar_desc = BarDescriptor(type=Bar) if not bar_desc else bar_desc
+    paths, parents, depths, args, kwargs, values, max_values = (
+        [], [], [], [], [], [], []
+    )
+
+    def _compile(tree, parent, depth, path):
+        """Append rows for the children of ``tree``
+
+        :returns: (sum of max_value of children, lines required)
+        """
+        ensure(
+            isinstance(tree, dict) and type(tree) != BarDescriptor,
+            TypeError, "Unexpected type {}".format(type(tree))
+        )
+        max_val = 0
+        lines_req = 2
+        for k, subtree in sorted(tree.items()):
+            i = len(paths)
+            paths.append(path + (k,))
+            parents.append(parent)
+            depths.append(depth)
+            args.append(None)
+            kwargs.append(None)
+            max_values.append(None)
+            if isinstance(subtree, BarDescriptor):
+                desc = subtree
+                values.append(subtree["value"])
+                node_max = subtree.get("kwargs", {}).get("max_value", 100)
+                lines_req += (
+                    1 if subtree.get("kwargs", {}).get("title_pos") in
+                    ["left", "right"] else 2
+                )
+            else:
+                values.append(None)
+                node_max, sub_lines_req = _compile(subtree, i, depth + 1,
+                                                   paths[i])
+                lines_req += sub_lines_req
+                # Merge in values from ``bar_desc`` for the non-leaf
+                desc = dict(bar_desc, kwargs=merge_dicts(
+                    [bar_desc.get("kwargs", {}), dict(max_value=node_max)]
+                ))
+            args[i] = tuple(desc.get("args", []))
+            kwargs[i] = dict(title_pos="above", title=k)
+            kwargs[i].update(desc.get("kwargs", {}))
+            max_values[i] = node_max
+            max_val += node_max
+        return max_val, lines_req
+
+    _, lines_required = _compile(tree, -1, 0, ())
+    return CompiledTree(
+        tuple(paths), tuple(parents), tuple(depths), tuple(args),
+        tuple(kwargs), tuple(values), tuple(max_values), lines_required
+    )
+
+
+class _Node(object):
+    """A node of the tree as drawn by ``ProgressTree``
+
+    Non-leaf nodes cache the sum of the values of the leaves below them;
+    a leaf node is a listener of its ``Value`` and, on every change,
+    adds the difference to itself and its ancestors and marks them
+    dirty so only they are rendered again on the next draw.
+    """
+
+    __slots__ = ("parent", "source", "bar", "row", "value", "lines",
+                 "dirty", "dirty_nodes")
+
+    def __init__(self, parent, source, dirty_nodes):
+        self.parent = parent
+        self.source = source
+        self.bar = None
+        self.row = 0
+        self.value = 0
+        self.lines = []
+        self.dirty = False
+        self.dirty_nodes = dirty_nodes
+
+    def update(self, delta):
+        node = self
+        while node is not None:
+            node.value += delta
+            if not node.dirty:
+                node.dirty = True
+                node.dirty_nodes.append(node)
+            node = node.parent
+
+    def set(self, value):
+        """Set the value of this node alone, e.g., to an externally
+        aggregated total"""
+        if value != self.value:
+            self.value = value
+            if not self.dirty:
+                self.dirty = True
+                self.dirty_nodes.append(self)
+
+
 class ProgressTree(object):
     """Progress display for trees
 
@@ -60,11 +248,49 @@ class ProgressTree(object):
     :param term: Terminal instance; if not given, will be created by the class
     :type  indent: int
     :param indent: The amount of indentation between each level in hierarchy
+    :type  diff: bool
+    :param diff: If this is set, each ``draw`` only rewrites the lines
+        that changed since the previous ``draw`` (see ``Frame``); the
+        cursor must then be left where the previous ``draw`` left it,
+        rather than being restored before drawing, and ``save_cursor``
+        is ignored.
+
+    The structure of a tree (its keys and ``BarDescriptor``s) is captured
+    the first time it is drawn; afterwards, only the bars of nodes whose
+    ``Value``s changed since the previous draw are rendered again. Call
+    ``invalidate`` after changing the structure of a tree that has
+    already been drawn.
+
+    :type  min_interval: float
+    :param min_interval: Minimum number of seconds between draws; a
+        ``draw`` arriving sooner than this after the previous one is
+        recorded, to be drawn by a later ``draw`` or by ``finish``
+    :type  max_fps: float|NoneType
+    :param max_fps: Maximum number of draws per second; if set, this
+        takes precedence over ``min_interval``
     """
 
-    def __init__(self, term=None, indent=4):
+    def __init__(self, term=None, indent=4, diff=False, min_interval=0,
+                 max_fps=None):
         self.cursor = Cursor(term)
         self.indent = indent
+        self.diff = diff
+        self._frame = Frame(self.cursor.term)
+        # {path: (args, kwargs, Bar)}; bars persist across draws and are
+        #   only rebuilt when the args/kwargs they were built with change
+        self._bars_by_path = {}
+        # Aggregated state of the tree last drawn
+        self._tree = None
+        self._bar_desc = None
+        self._compiled = None
+        self._totals = None
+        self._nodes = None
+        self._dirty_nodes = []
+        self._lines_required = 0
+        self._columns = None
+        self._min_interval = 1 / max_fps if max_fps else min_interval
+        self._last_draw = float("-inf")
+        self._pending = None
 
     ##################
     # Public Methods #
@@ -73,11 +299,14 @@ class ProgressTree(object):
     def draw(self, tree, bar_desc=None, save_cursor=True, flush=True):
         """Draw ``tree`` to the terminal
 
-        :type  tree: dict
+        :type  tree: dict|CompiledTree
         :param tree: ``tree`` should be a tree representing a hierarchy; each
             key should be a string describing that hierarchy level and value
             should also be ``dict`` except for leaves which should be
             ``BarDescriptors``. See ``BarDescriptor`` for a tree example.
+            May also be a ``CompiledTree`` from ``compile``, or an
+            ``ArrayTree`` holding leaf values for one, in which case
+            ``bar_desc`` is ignored.
         :type  bar_desc: BarDescriptor|NoneType
         :param bar_desc: For describing non-leaf bars in that will be
             drawn from ``tree``; certain attributes such as ``value``
@@ -90,23 +319,90 @@ class ProgressTree(object):
             drawing; this will OVERWRITE a previous save, so be sure to set
             this accordingly (to your needs).
         """
-        if save_cursor:
+        if self._min_interval:
+            now = monotonic()
+            if now - self._last_draw < self._min_interval:
+                self._pending = (tree, bar_desc, save_cursor, flush)
+                return
+            self._last_draw = now
+            self._pending = None
+
+        if save_cursor and not self.diff:
             self.cursor.save()
 
-        tree = deepcopy(tree)
+        if isinstance(tree, CompiledTree):
+            rebuilt = tree is not self._compiled
+            if rebuilt:
+                self._build(tree)
+        elif isinstance(tree, ArrayTree):
+            rebuilt = tree.compiled is not self._compiled
+            if rebuilt:
+                self._build(tree.compiled)
+            self._totals, changes = tree.changes(self._totals)
+            for i, total in changes:
+                self._nodes[i].set(total)
+        else:
+            bar_desc = BarDescriptor(type=Bar) if not bar_desc else bar_desc
+            rebuilt = tree is not self._tree or bar_desc != self._bar_desc
+            if rebuilt:
+                self._build(compile(tree, bar_desc))
+                self._tree = tree
+                self._bar_desc = bar_desc
         # TODO: Automatically collapse hierarchy so something
         #   will always be displayable (well, unless the top-level)
         #   contains too many to display
-        lines_required = self.lines_required(tree)
-        ensure(lines_required <= self.cursor.term.height,
+        height = self.cursor.term.height or 24
+        ensure(self._lines_required <= height,
                LengthOverflowError,
                "Terminal is not long ({} rows) enough to fit all bars "
-               "({} rows).".format(self.cursor.term.height, lines_required))
-        bar_desc = BarDescriptor(type=Bar) if not bar_desc else bar_desc
-        self._calculate_values(tree, bar_desc)
-        self._draw(tree)
-        if flush:
-            self.cursor.flush()
+               "({} rows).".format(height, self._lines_required))
+
+        # Bars measure the terminal when rendering, so everything has
+        #   to be rendered again if its width changed
+        columns = self.cursor.term.width or 80
+        if columns != self._columns:
+            self._columns = columns
+            self._mark_all_dirty()
+            rebuilt = True
+        self._render_dirty()
+
+        if self.diff:
+            if rebuilt:
+                self._frame.draw(
+                    [line for node in self._nodes for line in node.lines],
+                    flush=flush
+                )
+            else:
+                self._frame.update(self._changes, flush=flush)
+        else:
+            for node in self._nodes:
+                self.cursor.write(u"\n".join(node.lines))
+                self.cursor.newline()
+            if flush:
+                self.cursor.flush()
+
+    def finish(self):
+        """Carry out the latest ``draw`` suppressed by ``min_interval``,
+        if any, so the true end state is shown
+        """
+        if self._pending is not None:
+            tree, bar_desc, save_cursor, flush = self._pending
+            self._last_draw = float("-inf")
+            self.draw(tree, bar_desc, save_cursor=save_cursor, flush=flush)
+
+    def invalidate(self):
+        """Discard the captured structure of the tree last drawn
+
+        The next ``draw`` will capture the structure of its ``tree`` anew.
+        """
+        if self._nodes is not None:
+            with _lock:
+                for node in self._nodes:
+                    if node.source is not None:
+                        node.source._listeners.remove(node)
+        self._tree = self._bar_desc = self._compiled = self._nodes = None
+        self._totals = None
+        self._dirty_nodes = []
 
     def make_room(self, tree):
         """Clear lines in terminal below current cursor position as required
@@ -114,7 +410,7 @@ class ProgressTree(object):
         This is important to do before drawing to ensure sufficient
         room at the bottom of your terminal.
 
-        :type  tree: dict
+        :type  tree: dict|CompiledTree
         :param tree: tree as described in ``BarDescriptor``
         """
         lines_req = self.lines_required(tree)
@@ -122,7 +418,11 @@ class ProgressTree(object):
 
     def lines_required(self, tree, count=0):
         """Calculate number of lines required to draw ``tree``"""
-        if all([
+        if isinstance(tree, ArrayTree):
+            return tree.compiled.lines_required
+        elif isinstance(tree, CompiledTree):
+            return tree.lines_required
+        elif all([
             isinstance(tree, dict),
             type(tree) != BarDescriptor
         ]):
@@ -138,58 +438,76 @@ class ProgressTree(object):
     # Private Methods #
     ###################
 
-    def _calculate_values(self, tree, bar_d):
-        """Calculate values for drawing bars of non-leafs in ``tree``
-
-        Recurses through ``tree``, replaces ``dict``s with
-            ``(BarDescriptor, dict)`` so ``ProgressTree._draw`` can use
-            the ``BarDescriptor``s to draw the tree
+    def _build(self, compiled):
+        """Create nodes for ``compiled`` and aggregate its values"""
+        self.invalidate()
+        self._compiled = compiled
+        self._lines_required = compiled.lines_required
+        self._nodes = nodes = []
+        bars_by_path = {}
+        row = 0
+        for i, path in enumerate(compiled.paths):
+            parent = compiled.parents[i]
+            value = compiled.values[i]
+            node = _Node(nodes[parent] if parent >= 0 else None, value,
+                         self._dirty_nodes)
+            nodes.append(node)
+
+            args = [self.cursor.term] + list(compiled.args[i])
+            kwargs = dict(indent=compiled.depths[i] * self.indent)
+            kwargs.update(compiled.kwargs[i])
+            node.bar = self._get_bar(path, args, kwargs, bars_by_path)
+            # Bars always render to the same number of lines, so each
+            #   node's line offset is fixed for the structure
+            node.row = row
+            row += 1 if node.bar._title_pos in ["left", "right"] else 2
+        # Drop bars for nodes that are no longer in the tree
+        self._bars_by_path = bars_by_path
+
+        # Sum leaf values into their ancestors; children always come
+        #   after their parents
+        with _lock:
+            for node in reversed(nodes):
+                if node.source is not None:
+                    node.source._listeners.append(node)
+                    node.value = node.source.value
+                if node.parent is not None:
+                    node.parent.value += node.value
+        self._mark_all_dirty()
+
+    def _mark_all_dirty(self):
+        for node in self._nodes:
+            if not node.dirty:
+                node.dirty = True
+                self._dirty_nodes.append(node)
+
+    def _render_dirty(self):
+        """Render the bars of all dirty nodes
+
+        Sets ``self._changes`` to ``{line index: line}`` for the lines
+            of the rendered nodes.
         """
-        if all([
-            isinstance(tree, dict),
-            type(tree) != BarDescriptor
-        ]):
-            # Calculate value and max_value
-            max_val = 0
-            value = 0
-            for k in tree:
-                # Get descriptor by recursing
-                bar_desc = self._calculate_values(tree[k], bar_d)
-                # Reassign to tuple of (new descriptor, tree below)
-                tree[k] = (bar_desc, tree[k])
-                value += bar_desc["value"].value
-                max_val += bar_desc.get("kwargs", {}).get("max_value", 100)
-            # Merge in values from ``bar_d`` before returning descriptor
-            kwargs = merge_dicts(
-                [bar_d.get("kwargs", {}),
-                 dict(max_value=max_val)],
-                deepcopy=True
-            )
-            ret_d = merge_dicts(
-                [bar_d,
-                 dict(value=Value(floor(value)), kwargs=kwargs)],
-                deepcopy=True
-            )
-            return BarDescriptor(ret_d)
-        elif isinstance(tree, BarDescriptor):
-            return tree
+        self._changes = {}
+        with _lock:
+            dirty_nodes = self._dirty_nodes[:]
+            del self._dirty_nodes[:]
+            for node in dirty_nodes:
+                node.dirty = False
+        for node in dirty_nodes:
+            node.lines = node.bar.render(node.value)
+            for i, line in enumerate(node.lines):
+                self._changes[node.row + i] = line
+
+    def _get_bar(self, path, args, kwargs, bars_by_path):
+        """Get the ``Bar`` for the node at ``path``
+
+        The ``Bar`` from the previous build is reused unless ``args``
+            or ``kwargs`` differ from the ones it was created with.
+        """
+        cached = self._bars_by_path.get(path)
+        if cached is not None and cached[0] == args and cached[1] == kwargs:
+            b = cached[2]
         else:
-            raise TypeError("Unexpected type {}".format(type(tree)))
-
-    def _draw(self, tree, indent=0):
-        """Recurse through ``tree`` and draw all nodes"""
-        if all([
-            isinstance(tree, dict),
-            type(tree) != BarDescriptor
-        ]):
-            for k, v in sorted(tree.items()):
-                bar_desc, subdict = v[0], v[1]
-
-                args = [self.cursor.term] + bar_desc.get("args", [])
-                kwargs = dict(title_pos="above", indent=indent, title=k)
-                kwargs.update(bar_desc.get("kwargs", {}))
-
-                b = Bar(*args, **kwargs)
-                b.draw(value=bar_desc["value"].value, flush=False)
-
-                self._draw(subdict, indent=indent + self.indent)
+            b = Bar(*args, **kwargs)
+        bars_by_path[path] = (args, kwargs, b)
+        return b
@@ -2,6 +2,11 @@ import math
 import copy
 from itertools import chain
 
+try:
+    from time import monotonic
+except ImportError:  # Python 2
+    from time import time as monotonic
+
 
 def floor(x):
     """Returns the floor of ``x``
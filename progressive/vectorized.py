@@ -0,0 +1,100 @@
+"""Array-backed aggregation of tree values
+
+Uses NumPy if it is installed, falling back to pure Python otherwise.
+"""
+from __future__ import division
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+
+class ArrayTree(object):
+    """Leaf values of a ``CompiledTree`` kept in a single array
+
+    Rather than through ``Value`` objects, leaves are updated by writing
+    into ``leaf_values`` directly, e.g.,
+    ``a.leaf_values[a.leaf_positions[path]] += 1``; totals of all non-leaf
+    nodes are then computed in one pass per level of the tree. May be
+    passed to ``ProgressTree.draw`` in place of a tree.
+
+    :type  compiled: CompiledTree
+    :param compiled: The tree to hold the leaf values of; leaf values
+        are initialized from its ``Value``s
+    :type  use_numpy: bool|NoneType
+    :param use_numpy: Set to ``False`` to use pure Python even if NumPy
+        is installed; ``None`` uses NumPy if it is installed
+    """
+
+    def __init__(self, compiled, use_numpy=None):
+        self.compiled = compiled
+        self.use_numpy = np is not None if use_numpy is None else use_numpy
+
+        leaves = [i for i, v in enumerate(compiled.values) if v is not None]
+        self.leaf_positions = dict(
+            (compiled.paths[i], j) for j, i in enumerate(leaves)
+        )
+        values = [compiled.values[i].value for i in leaves]
+
+        # (child indices, their parents' indices) for every level that
+        #   has a parent, deepest first, so that totals of a level are
+        #   complete before being added to the level above
+        max_depth = max(compiled.depths) if len(compiled) else 0
+        levels = [([], []) for _ in range(max_depth)]
+        for i, depth in enumerate(compiled.depths):
+            if depth > 0:
+                levels[depth - 1][0].append(i)
+                levels[depth - 1][1].append(compiled.parents[i])
+        levels.reverse()
+
+        if self.use_numpy:
+            self._leaves = np.array(leaves, dtype=np.intp)
+            self.leaf_values = np.array(values, dtype=np.int64)
+            self._levels = [(np.array(c, dtype=np.intp),
+                             np.array(p, dtype=np.intp)) for c, p in levels]
+        else:
+            self._leaves = leaves
+            self.leaf_values = values
+            self._levels = levels
+
+    def totals(self):
+        """Compute the value of every node of the tree
+
+        :returns: Array (or ``list`` without NumPy) of the value of each
+            node, in the order of the nodes of ``compiled``
+        """
+        n = len(self.compiled)
+        if self.use_numpy:
+            totals = np.zeros(n, dtype=np.int64)
+            totals[self._leaves] = self.leaf_values
+            for children, parents in self._levels:
+                totals += np.bincount(
+                    parents, weights=totals[children], minlength=n
+                ).astype(np.int64)
+        else:
+            totals = [0] * n
+            for i, value in zip(self._leaves, self.leaf_values):
+                totals[i] = int(value)
+            for children, parents in self._levels:
+                for child, parent in zip(children, parents):
+                    totals[parent] += totals[child]
+        return totals
+
+    def changes(self, previous=None):
+        """Compute totals and find those that differ from ``previous``
+
+        :param previous: Totals as returned by an earlier call, or None
+        :returns: (totals, [(node index, total), ...] for every node
+            whose total differs from ``previous``; all nodes if
+            ``previous`` is None)
+        """
+        totals = self.totals()
+        if previous is None:
+            indices = range(len(totals))
+        elif self.use_numpy:
+            indices = np.flatnonzero(totals != previous).tolist()
+        else:
+            indices = [i for i, (a, b) in enumerate(zip(totals, previous))
+                       if a != b]
+        return totals, [(i, int(totals[i])) for i in indices]
@@ -27,6 +27,7 @@ setup(
     long_description_content_type='text/markdown',
     packages=['progressive'],
     install_requires = install_requires,
+    extras_require={"numpy": ["numpy"]},
     classifiers=[
         "Development Status :: 3 - Alpha",
         'Environment :: Console',
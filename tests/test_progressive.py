@@ -1,5 +1,51 @@
+"""Tests module for progressive"""
+import asyncio
+import multiprocessing
+import os
+import threading
+from io import StringIO
+
+from blessings import Terminal
+
+from progressive.aio import live
+from progressive.bar import Bar
 from progressive.examples import tree, simple
 from progressive.exceptions import LengthOverflowError
+from progressive.frame import Frame
+from progressive.tree import ProgressTree, Value, BarDescriptor, compile
+from progressive.server import AggregationServer, AggregationClient
+from progressive.shared import SharedLeaves
+from progressive.threaded import RenderThread
+from progressive.vectorized import ArrayTree, np
+
+
+class FakeTerminal(Terminal):
+    """xterm-256color ``Terminal`` of fixed size writing to a ``StringIO``"""
+
+    height = 50
+    width = 100
+
+    def __init__(self):
+        super(FakeTerminal, self).__init__(
+            kind="xterm-256color", stream=StringIO(), force_styling=True
+        )
+
+    def output(self):
+        """Return and clear everything written so far"""
+        s = self.stream.getvalue()
+        self.stream.seek(0)
+        self.stream.truncate()
+        return s
+
+
+def make_tree(leaf_values):
+    bd_defaults = dict(type=Bar, kwargs=dict(max_value=10))
+    return {
+        "Job": {
+            "Task {}".format(i): BarDescriptor(value=v, **bd_defaults)
+            for i, v in enumerate(leaf_values)
+        }
+    }
 
 
 class TestExamples(object):
@@ -12,3 +58,327 @@ class TestExamples(object):
 
     def test_simple_example(self):
         simple()
+
+
+class TestBar(object):
+
+    def test_render_matches_draw(self):
+        t = FakeTerminal()
+        b = Bar(term=t, max_value=10, title_pos="above")
+        lines = b.render(5)
+        assert len(lines) == 2
+        b.draw(5, newline=False)
+        assert t.output() == u"\n".join(lines)
+
+
+    def test_min_interval_suppresses_draws(self):
+        t = FakeTerminal()
+        b = Bar(term=t, max_value=100, min_interval=60)
+        b.draw(1)
+        assert "1/100" in t.output()
+        for i in range(2, 50):
+            b.draw(i)
+        assert t.output() == u""
+        b.finish()
+        out = t.output()
+        assert "49/100" in out
+        b.finish()
+        assert t.output() == u""
+        # The end state is never suppressed
+        b.draw(100)
+        assert "100/100" in t.output()
+
+
+class TestFrame(object):
+
+    def test_unchanged_frame_writes_nothing(self):
+        t = FakeTerminal()
+        f = Frame(t)
+        f.draw(["a", "b", "c"])
+        assert t.output()
+        assert f.draw(["a", "b", "c"]) == 0
+        assert t.output() == u""
+
+    def test_only_changed_lines_rewritten(self):
+        t = FakeTerminal()
+        f = Frame(t)
+        f.draw(["aaa", "bbb", "ccc"])
+        t.output()
+        assert f.draw(["aaa", "BBB", "ccc"]) == 1
+        out = t.output()
+        assert "BBB" in out
+        assert "aaa" not in out and "ccc" not in out
+        # Up two lines from below the frame, then back down two
+        assert out.startswith(t.move_up * 2)
+
+
+class TestProgressTree(object):
+
+    def test_diff_draw_only_rewrites_changed_bars(self):
+        t = FakeTerminal()
+        leaf_values = [Value(0) for i in range(5)]
+        test_d = make_tree(leaf_values)
+        n = ProgressTree(term=t, diff=True)
+        n.draw(test_d)
+        full = t.output()
+        n.draw(test_d)
+        assert t.output() == u""
+        leaf_values[3].value = 4
+        n.draw(test_d)
+        partial = t.output()
+        assert 0 < len(partial) < len(full)
+        assert "4/10" in partial
+
+    def test_bars_persist_across_draws(self):
+        t = FakeTerminal()
+        leaf_values = [Value(0) for i in range(3)]
+        test_d = make_tree(leaf_values)
+        n = ProgressTree(term=t)
+        n.draw(test_d)
+        bars = dict((p, b) for p, (_, _, b) in n._bars_by_path.items())
+        leaf_values[0].value = 5
+        n.draw(test_d)
+        assert all(n._bars_by_path[p][2] is b for p, b in bars.items())
+
+        # Changing a descriptor's kwargs rebuilds only that node's Bar
+        test_d["Job"]["Task 1"]["kwargs"] = dict(max_value=20)
+        n.invalidate()
+        n.draw(test_d)
+        assert n._bars_by_path[("Job", "Task 1")][2] is not \
+            bars[("Job", "Task 1")]
+        assert n._bars_by_path[("Job", "Task 0")][2] is bars[("Job", "Task 0")]
+
+    def test_only_dirty_nodes_rendered(self):
+        t = FakeTerminal()
+        leaf_values = [Value(0) for i in range(4)]
+        test_d = {"Job": {"A": make_tree(leaf_values[:2]),
+                          "B": make_tree(leaf_values[2:])}}
+        n = ProgressTree(term=t, diff=True)
+        n.draw(test_d)
+        rendered = []
+        for node in n._nodes:
+            node.bar.render = (lambda render: lambda value: (
+                rendered.append(value) or render(value)))(node.bar.render)
+        n.draw(test_d)
+        assert rendered == []
+
+        leaf_values[3].value = 7
+        n.draw(test_d)
+        # The leaf, its two ancestor "Job"s and "B"
+        assert sorted(rendered) == [7, 7, 7, 7]
+        assert "7/20" in t.output()
+
+    def test_aggregated_values(self):
+        t = FakeTerminal()
+        leaf_values = [Value(i) for i in range(4)]
+        test_d = {"Job": {"A": make_tree(leaf_values[:2]),
+                          "B": make_tree(leaf_values[2:])}}
+        n = ProgressTree(term=t)
+        n.draw(test_d)
+        leaf_values[0].value += 5
+        leaf_values[3].value = 0
+        n.draw(test_d)
+        values = dict((p, node.value) for p, node in zip(
+            sorted(n._bars_by_path), n._nodes))
+        assert values[("Job",)] == 0 + 5 + 1 + 2 + 0
+        assert values[("Job", "A")] == 6
+        assert values[("Job", "B", "Job")] == 2
+
+    def test_max_fps(self):
+        t = FakeTerminal()
+        leaf_values = [Value(0) for i in range(2)]
+        test_d = make_tree(leaf_values)
+        n = ProgressTree(term=t, diff=True, max_fps=0.01)
+        n.draw(test_d)
+        t.output()
+        leaf_values[0].value = 3
+        n.draw(test_d)
+        assert t.output() == u""
+        n.finish()
+        assert "3/10" in t.output()
+
+
+class TestCompile(object):
+
+    def test_table(self):
+        leaf_values = [Value(i) for i in range(4)]
+        test_d = {"Job": {"B": make_tree(leaf_values[2:]),
+                          "A": make_tree(leaf_values[:2])}}
+        c = compile(test_d, BarDescriptor(kwargs=dict(width="10c")))
+        assert c.paths[:3] == (("Job",), ("Job", "A"), ("Job", "A", "Job"))
+        assert c.parents == (-1, 0, 1, 2, 2, 0, 5, 6, 6)
+        assert c.depths == (0, 1, 2, 3, 3, 1, 2, 3, 3)
+        assert c.values[3] is leaf_values[0]
+        assert c.values[:3] == (None, None, None)
+        assert c.max_values[0] == 40
+        assert c.kwargs[0] == dict(title_pos="above", title="Job",
+                                   width="10c", max_value=40)
+        assert c.lines_required == ProgressTree(FakeTerminal()).lines_required(
+            test_d)
+
+    def test_draw_compiled_matches_dict(self):
+        leaf_values = [Value(i) for i in range(4)]
+        test_d = make_tree(leaf_values)
+        t1, t2 = FakeTerminal(), FakeTerminal()
+        ProgressTree(term=t1).draw(test_d)
+        ProgressTree(term=t2).draw(compile(test_d))
+        assert t1.output() == t2.output()
+
+
+class TestArrayTree(object):
+
+    def _check_totals(self, use_numpy):
+        leaf_values = [Value(i) for i in range(6)]
+        test_d = {"Job": {"A": make_tree(leaf_values[:2]),
+                          "B": make_tree(leaf_values[2:5]),
+                          "C": BarDescriptor(value=leaf_values[5])}}
+        c = compile(test_d)
+        a = ArrayTree(c, use_numpy=use_numpy)
+        n = ProgressTree(term=FakeTerminal())
+        n.draw(c)
+        assert list(a.totals()) == [node.value for node in n._nodes]
+
+        a.leaf_values[a.leaf_positions[("Job", "B", "Job", "Task 1")]] = 9
+        leaf_values[3].value = 9
+        n.draw(c)
+        assert list(a.totals()) == [node.value for node in n._nodes]
+
+    def test_totals_pure_python(self):
+        self._check_totals(use_numpy=False)
+
+    def test_totals_numpy(self):
+        if np is None:
+            return
+        self._check_totals(use_numpy=True)
+
+    def test_draw_array_tree(self):
+        t = FakeTerminal()
+        c = compile(make_tree([Value(0) for i in range(3)]))
+        a = ArrayTree(c)
+        n = ProgressTree(term=t, diff=True)
+        n.draw(a)
+        t.output()
+        n.draw(a)
+        assert t.output() == u""
+        a.leaf_values[a.leaf_positions[("Job", "Task 2")]] = 6
+        n.draw(a)
+        out = t.output()
+        assert "6/10" in out and "6/30" in out
+
+
+class TestRenderThread(object):
+
+    def test_workers_add_while_rendering(self):
+        t = FakeTerminal()
+        leaf_values = [Value(0) for i in range(2)]
+        test_d = make_tree(leaf_values)
+        # max_value is exceeded, but that is fine for counting
+        n = ProgressTree(term=t, diff=True)
+
+        def work():
+            for i in range(2000):
+                leaf_values[i % 2].add()
+
+        with RenderThread(n, test_d, fps=200):
+            workers = [threading.Thread(target=work) for i in range(4)]
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+        assert [v.value for v in leaf_values] == [4000, 4000]
+        assert n._nodes[0].value == 8000
+        assert "8000/20" in t.output()
+
+    def test_bar_final_frame(self):
+        t = FakeTerminal()
+        v = Value(0)
+        b = Bar(term=t, max_value=10)
+        with RenderThread(b, v, fps=1):
+            v.value = 7
+        assert t.output().endswith(b.render(7)[0] + t.move_down + t.clear_bol)
+
+
+class TestLive(object):
+
+    def test_live_tree(self):
+        leaf_values = [Value(0) for i in range(3)]
+        test_d = make_tree(leaf_values)
+        r, w = os.pipe()
+        stream = os.fdopen(w, "w")
+
+        async def work(v):
+            for i in range(10):
+                v.value += 1
+                await asyncio.sleep(0.001)
+
+        async def main():
+            async with live(test_d, fps=100, stream=stream):
+                await asyncio.gather(*[work(v) for v in leaf_values])
+
+        asyncio.run(main())
+        stream.close()
+        with os.fdopen(r) as f:
+            out = f.read()
+        assert "30/30" in out
+        assert out.count("10/10") >= 3
+
+
+def _shared_work(shared_value):
+    for i in range(5):
+        shared_value.add(2)
+
+
+class TestSharedLeaves(object):
+
+    def test_children_update_parent_tree(self):
+        leaf_values = [Value(1) for i in range(4)]
+        c = compile(make_tree(leaf_values))
+        t = FakeTerminal()
+        n = ProgressTree(term=t, diff=True)
+        with SharedLeaves(c) as leaves:
+            n.draw(leaves)
+            assert leaves.totals()[0] == 4
+            ctx = multiprocessing.get_context("fork")
+            with ctx.Pool(2) as pool:
+                pool.map(_shared_work, [leaves.value(path)
+                                        for path in leaves.leaf_positions])
+            t.output()
+            n.draw(leaves)
+            assert leaves.totals()[0] == 44
+            assert "44/40" in t.output()
+        # Values are kept after the shared memory is freed
+        assert list(leaves.leaf_values) == [11] * 4
+
+
+class TestAggregationServer(object):
+
+    def test_clients_feed_one_tree(self):
+        t = FakeTerminal()
+        server = AggregationServer(("127.0.0.1", 0),
+                                   ProgressTree(term=t, diff=True), fps=100)
+
+        def send(n):
+            with AggregationClient(server.address, interval=0.01) as client:
+                for i in range(500):
+                    client.add(["Job", "Worker {}".format(n % 3)],
+                               max_value=1000)
+
+        with server:
+            senders = [threading.Thread(target=send, args=(n,))
+                       for n in range(6)]
+            for sender in senders:
+                sender.start()
+            for sender in senders:
+                sender.join()
+        values = dict((k, d["value"].value)
+                      for k, d in server.tree["Job"].items())
+        assert values == {"Worker 0": 1000, "Worker 1": 1000,
+                          "Worker 2": 1000}
+        assert "3000/3000" in t.output()
+
+    def test_invalid_entries_ignored(self):
+        server = AggregationServer(("127.0.0.1", 0),
+                                   ProgressTree(term=FakeTerminal()))
+        server.apply([[["A", "B"], 2], [["A"], 1], ["oops"], [[], 1]])
+        assert server.tree["A"]["B"]["value"].value == 2
+        server.stop()